@@ -5,11 +5,19 @@
 # Agent I/O models
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import random
+from contextlib import asynccontextmanager
 from datetime import date, timedelta
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Tuple, TypeVar, Union
 
-from pydantic import BaseModel, Field, ConfigDict
+import httpx
+from cachetools import TTLCache
+from openai import APIConnectionError, AsyncOpenAI
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr
 from pydantic_ai import Agent, RunContext
+from pydantic_ai.exceptions import ModelHTTPError
 from pydantic_ai.models.openai import OpenAIChatModel
 from pydantic_ai.providers.openai import OpenAIProvider
 from pydantic_ai.usage import UsageLimits
@@ -38,6 +46,9 @@ class AgentInput(BaseModel):
     # If the user continues a conversation, you can optionally pass the current plan:
     current_plan: Optional[VacationPlan] = None
 
+    # Preferences loaded once per agent run and shared by every tool call
+    _prefs_cache: Optional[UserPreferences] = PrivateAttr(None)
+
 
 class AgentOutput(BaseModel):
     """
@@ -51,58 +62,85 @@ class AgentOutput(BaseModel):
     ask_for_booking_confirmation: bool = False
 
 
+class TripOptions(BaseModel):
+    """
+    Flight and hotel candidates returned together by search_trip_options_tool.
+    """
+    flights: List[FlightOption]
+    hotels: List[HotelOption]
+
+
+class TripIntent(BaseModel):
+    """
+    Structured trip request extracted by the intent agent.
+    """
+    is_new_trip_request: bool = Field(
+        ...,
+        description="True only for a fresh planning request naming a destination "
+        "and either exact dates or a trip duration",
+    )
+    destination_city: Optional[str] = None
+    destination_code: Optional[str] = Field(
+        None, description="Destination airport/IATA code, if known"
+    )
+    origin: Optional[str] = Field(
+        None, description="Departure city or airport, only if the user gave one"
+    )
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    duration_days: Optional[int] = None
+    wants_booking: bool = Field(
+        False, description="True only if the user explicitly asked to book"
+    )
+
+
 
 # Instantiate the Agent
 settings = get_settings()
 
-# Configure the OpenAI model (GPT-5 nano, etc.)
-openai_model = OpenAIChatModel(settings.openai_model_name, provider=OpenAIProvider(api_key=settings.openai_api_key))
+
+def _build_openai_model() -> Tuple[OpenAIChatModel, httpx.AsyncClient]:
+    """
+    Configure the OpenAI model (GPT-5 nano, etc.) on its own pooled HTTP/2 client,
+    so concurrent chat requests reuse (and multiplex over) kept-alive connections
+    instead of opening new ones. Returns the model and the client to close.
+
+    The SDK's own retries are disabled so _run_with_retry is the only retry
+    layer, and every model request (not the whole multi-turn agent run) is
+    bounded by agent_request_timeout.
+    """
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+    )
+    openai_client = AsyncOpenAI(
+        api_key=settings.openai_api_key,
+        http_client=http_client,
+        max_retries=0,
+        timeout=httpx.Timeout(settings.agent_request_timeout, connect=3.0),
+    )
+    model = OpenAIChatModel(
+        settings.openai_model_name,
+        provider=OpenAIProvider(openai_client=openai_client),
+    )
+    return model, http_client
+
+
+# Default model for use outside the app lifespan (scripts, tests);
+# openai_connection_pool swaps in a fresh one per app run
+openai_model, _ = _build_openai_model()
+
+# Caps the number of agent runs in flight against the provider at once
+_agent_semaphore = asyncio.Semaphore(settings.agent_max_concurrency)
 
 AGENT_SYSTEM_PROMPT = """
-You are a vacation planning assistant that proposes itineraries; you do NOT perform real-world bookings.
-
-You have exactly these tools available:
-
-- load_preferences() -> UserPreferences
-- get_free_date_ranges(trip_duration_days: int) -> list[DateRange]
-- search_flights_tool(origin: str, destination: str, start: date, end: date) -> list[FlightOption]
-- search_hotels_tool(destination_city: str, start: date, end: date) -> list[HotelOption]
-- build_vacation_plan(destination_city: str, start: date, end: date,
-                    flight: FlightOption, hotel: HotelOption) -> VacationPlan
-
-Hard rules:
-
-1. Never call any tool whose name is not in the list above.
-Do NOT invent tools for booking, payment, or anything else.
-
-2. For a normal planning request (user gives destination + duration or dates),
-you should use tools at most once each in this order:
-
-a. Call load_preferences once at the beginning.
-b. If the user did NOT specify exact dates, call get_free_date_ranges once
-    to pick a suitable DateRange.
-c. Call search_flights_tool once to pick a flight.
-d. Call search_hotels_tool once to pick a hotel.
-e. Call build_vacation_plan once using the chosen dates, flight, and hotel.
-
-Do NOT loop or "try again" with different parameters unless the first
-attempt completely fails (e.g. the tools return empty lists).
-
-3. If information is missing (no destination, no duration, etc.):
-- Do NOT call any tools.
-- Instead, return an AgentOutput where:
-    - assistant_message asks the user clear follow-up questions.
-    - updated_plan is null.
-    - ask_for_booking_confirmation is False.
-
-4. When you are satisfied with the plan:
-- Call the output tool exactly once with an AgentOutput object where:
-    - assistant_message is a friendly explanation of the itinerary.
-    - updated_plan is the VacationPlan returned by build_vacation_plan.
-    - ask_for_booking_confirmation is True only if the user explicitly
-        asked you to book, otherwise False.
-
-5. You never process raw payment details and never treat anything as "booked".
+Vacation planning assistant. You propose itineraries; you never book anything.
+Tools: load_preferences, get_free_date_ranges, search_trip_options_tool, build_vacation_plan.
+1. Use only these tools, each at most once, in that order; skip get_free_date_ranges if dates are given.
+2. Retry a tool only if it returned an empty list.
+3. Missing destination or duration/dates: call no tools, ask follow-up questions, updated_plan=null.
+4. Finish with one AgentOutput: friendly itinerary summary + the plan from build_vacation_plan.
+5. ask_for_booking_confirmation=true only if the user explicitly asked to book.
 """
 
 vacation_agent: Agent[AgentInput, AgentOutput] = Agent(
@@ -113,15 +151,167 @@ vacation_agent: Agent[AgentInput, AgentOutput] = Agent(
 )
 
 
+INTENT_SYSTEM_PROMPT = """
+Extract a structured trip request from the user's message.
+Set is_new_trip_request to true only if the message asks for a new trip plan
+with a destination and either exact dates or a duration in days.
+Follow-up edits to an existing plan, questions, and anything ambiguous are false.
+Resolve relative dates against the given current date. Never guess missing values.
+"""
+
+SUMMARY_SYSTEM_PROMPT = """
+You are a vacation planning assistant. Given the user's request and the
+VacationPlan JSON, write a short, friendly explanation of the itinerary.
+Do not change any facts in the plan and never describe anything as booked.
+"""
+
+# Cheap structured-extraction pass for the deterministic planning path
+intent_agent: Agent[None, TripIntent] = Agent(
+    model=openai_model,
+    output_type=TripIntent,
+    system_prompt=INTENT_SYSTEM_PROMPT,
+)
+
+# Turns a plan built in Python into prose
+summary_agent: Agent[None, str] = Agent(
+    model=openai_model,
+    output_type=str,
+    system_prompt=SUMMARY_SYSTEM_PROMPT,
+)
+
+
+
+@asynccontextmanager
+async def openai_connection_pool() -> AsyncIterator[None]:
+    """
+    Give every agent a fresh pooled OpenAI client for the app's lifetime and
+    close it afterwards. Building it per run keeps the pool bound to the
+    running event loop, so a second app lifespan never sees a closed client.
+    """
+    model, http_client = _build_openai_model()
+    for agent in (vacation_agent, intent_agent, summary_agent):
+        agent.model = model
+    try:
+        yield
+    finally:
+        await http_client.aclose()
+
+
+
+# Planning helpers shared by the agent tools and the deterministic path
+
+async def _search_trip_options(
+    prefs: UserPreferences,
+    origin: str,
+    destination: str,
+    destination_city: str,
+    start: date,
+    end: date,
+) -> TripOptions:
+    """
+    Run the mock flight and hotel searches concurrently.
+    """
+    max_budget = prefs.max_budget_total or prefs.max_budget_per_day
+    date_range = DateRange(start=start, end=end)
+
+    flights, hotels = await asyncio.gather(
+        asyncio.to_thread(
+            mock_search_flights,
+            origin=origin,
+            destination=destination,
+            date_range=date_range,
+            max_budget=max_budget,
+            currency=prefs.default_currency,
+        ),
+        asyncio.to_thread(
+            mock_search_hotels,
+            destination_city=destination_city,
+            start_date=start,
+            end_date=end,
+            max_budget_total=prefs.max_budget_total,
+            currency=prefs.default_currency,
+        ),
+    )
+    return TripOptions(flights=flights, hotels=hotels)
+
+
+def _assemble_plan(
+    user_id: str,
+    prefs: UserPreferences,
+    destination_city: str,
+    start: date,
+    end: date,
+    flight: FlightOption,
+    hotel: HotelOption,
+) -> VacationPlan:
+    """
+    Build a day-by-day VacationPlan from the chosen dates, flight and hotel.
+    """
+    # Number of days; ensure at least 1
+    num_days = (end - start).days
+    if num_days <= 0:
+        num_days = 1
+
+    # Naive total cost: flight + hotel total
+    total_cost = flight.price + hotel.total_price
+
+    # Same activities every day; build the strings once
+    interests_str = ", ".join(prefs.interests) or "free time"
+    morning = f"Explore a local attraction in {destination_city}."
+    afternoon = f"Enjoy something related to your interests: {interests_str}."
+    evening = f"Dinner at a recommended spot in {destination_city}."
+
+    # model_construct skips validation. Safe only because every field here is
+    # already validated: dates/flight/hotel come from validated models or
+    # BuildVacationPlanArgs, prefs from storage, and the rest is built above.
+    daily_plans: List[DayPlan] = []
+    for i in range(num_days):
+        day_date = start + timedelta(days=i)
+        daily_plans.append(
+            DayPlan.model_construct(
+                date=day_date,
+                morning=morning,
+                afternoon=afternoon,
+                evening=evening,
+                notes=None,
+            )
+        )
+
+    plan = VacationPlan.model_construct(
+        user_id=user_id,
+        destination_city=destination_city,
+        start_date=start,
+        end_date=end,
+        flight=flight,
+        hotel=hotel,
+        daily_plans=daily_plans,
+        estimated_total_cost=total_cost,
+        currency=prefs.default_currency,
+        status="planned",
+    )
+    return plan
+
+
 
 # Tools for the agent
 
+def _run_preferences(ctx: RunContext[AgentInput]) -> UserPreferences:
+    """
+    Return the user's preferences, loading them at most once per agent run.
+    """
+    prefs = ctx.deps._prefs_cache
+    if prefs is None:
+        prefs = get_user_preferences(ctx.deps.user_id)
+        ctx.deps._prefs_cache = prefs
+    return prefs
+
+
 @vacation_agent.tool
 def load_preferences(ctx: RunContext[AgentInput]) -> UserPreferences:
     """
-    Load user preferences from the storage layer.
+    Load user preferences from the storage layer. Call once, before any other tool.
     """
-    return get_user_preferences(ctx.deps.user_id)
+    return _run_preferences(ctx)
 
 
 @vacation_agent.tool
@@ -131,6 +321,7 @@ def get_free_date_ranges(
 ) -> list[DateRange]:
     """
     Find free date ranges in the next 60 days that can fit the requested trip duration.
+    Only needed when the user did not give exact dates.
     """
     user_id = ctx.deps.user_id
     return find_free_date_ranges(
@@ -141,46 +332,26 @@ def get_free_date_ranges(
 
 
 @vacation_agent.tool
-def search_flights_tool(
+async def search_trip_options_tool(
     ctx: RunContext[AgentInput],
     origin: str,
     destination: str,
+    destination_city: str,
     start: date,
     end: date,
-) -> list[FlightOption]:
+) -> TripOptions:
     """
-    Search mock flights between origin and destination near the chosen dates.
+    Search mock flights (origin -> destination) and mock hotels in destination_city
+    for the chosen dates. Both searches run concurrently.
+    Pick one flight and one hotel from the result for build_vacation_plan.
     """
-    prefs = get_user_preferences(ctx.deps.user_id)
-    max_budget = prefs.max_budget_total or prefs.max_budget_per_day
-    date_range = DateRange(start=start, end=end)
-    return mock_search_flights(
+    return await _search_trip_options(
+        _run_preferences(ctx),
         origin=origin,
         destination=destination,
-        date_range=date_range,
-        max_budget=max_budget,
-        currency=prefs.default_currency,
-    )
-
-
-@vacation_agent.tool
-def search_hotels_tool(
-    ctx: RunContext[AgentInput],
-    destination_city: str,
-    start: date,
-    end: date,
-) -> list[HotelOption]:
-    """
-    Search mock hotels for the chosen date range.
-    """
-    prefs = get_user_preferences(ctx.deps.user_id)
-    max_total = prefs.max_budget_total
-    return mock_search_hotels(
         destination_city=destination_city,
-        start_date=start,
-        end_date=end,
-        max_budget_total=max_total,
-        currency=prefs.default_currency,
+        start=start,
+        end=end,
     )
 
 class BuildVacationPlanArgs(BaseModel):
@@ -199,68 +370,233 @@ def build_vacation_plan(
     args: BuildVacationPlanArgs,
 ) -> VacationPlan:
     """
-    Construct a VacationPlan from chosen options.
+    Construct a VacationPlan from chosen options. The plan is a proposal only:
+    it is never paid for or booked, and no payment details are ever needed.
 
     NOTE:
     - The LLM may send extra fields (daily_plans, currency, estimated_total_cost, etc.)
     in the tool call.
     Because BuildVacationPlanArgs has extra='ignore', those are silently dropped.
     """
-    prefs = get_user_preferences(ctx.deps.user_id)
+    return _assemble_plan(
+        user_id=ctx.deps.user_id,
+        prefs=_run_preferences(ctx),
+        destination_city=args.destination_city,
+        start=args.start,
+        end=args.end,
+        flight=args.flight,
+        hotel=args.hotel,
+    )
 
-    destination_city = args.destination_city
-    start = args.start
-    end = args.end
-    flight = args.flight
-    hotel = args.hotel
 
-    # Number of days; ensure at least 1
-    num_days = (end - start).days
-    if num_days <= 0:
-        num_days = 1
 
-    # Naive total cost: flight + hotel total
-    total_cost = flight.price + hotel.total_price
+# Intent extraction and summarisation are single-shot; allow one output retry
+_FAST_PATH_LIMITS = UsageLimits(request_limit=3)
 
-    daily_plans: List[DayPlan] = []
-    for i in range(num_days):
-        day_date = start + timedelta(days=i)
-        daily_plans.append(
-            DayPlan(
-                date=day_date,
-                morning=f"Explore a local attraction in {destination_city}.",
-                afternoon=(
-                    f"Enjoy something related to your interests: "
-                    f"{', '.join(prefs.interests) or 'free time'}."
-                ),
-                evening=f"Dinner at a recommended spot in {destination_city}.",
-                notes=None,
+# A well-specified plan needs at most 4 tool calls plus the output call;
+# tight limits cut off runaway retry loops early
+_FALLBACK_LIMITS = UsageLimits(
+    request_limit=settings.agent_request_limit,
+    tool_calls_limit=settings.agent_tool_calls_limit,
+)
+
+# Agent response cache, bounded in size and expiring after the configured TTL
+_AGENT_CACHE: TTLCache[str, AgentOutput] = TTLCache(
+    maxsize=1_000, ttl=max(settings.agent_cache_ttl_seconds, 1.0)
+)
+
+
+def _agent_cache_key(
+    user_id: str,
+    user_message: str,
+    allow_booking: bool,
+    current_plan: Optional[VacationPlan],
+) -> Optional[str]:
+    """
+    Cache key for a chat turn, or None if the turn must not be cached.
+    The user's current preferences are part of the key, so a preference update
+    is never answered with a plan built from the old ones.
+    """
+    # Never serve booking-related turns from the cache
+    if allow_booking or settings.agent_cache_ttl_seconds <= 0:
+        return None
+    prefs_json = get_user_preferences(user_id).model_dump_json()
+    plan_json = current_plan.model_dump_json() if current_plan else ""
+    raw = f"{user_id}|{user_message}|{prefs_json}|{plan_json}"
+    return hashlib.blake2b(raw.encode()).hexdigest()
+
+
+def _cache_get(cache_key: Optional[str]) -> Optional[AgentOutput]:
+    if cache_key is None:
+        return None
+    return _AGENT_CACHE.get(cache_key)
+
+
+def _cache_put(cache_key: Optional[str], output: AgentOutput) -> None:
+    if cache_key is not None:
+        _AGENT_CACHE[cache_key] = output
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """
+    Timeouts, connection drops, rate limits and 5xx responses are worth retrying;
+    other provider errors (bad request, auth) will fail the same way again.
+    """
+    if isinstance(exc, ModelHTTPError):
+        return exc.status_code == 429 or exc.status_code >= 500
+    # Connection errors and request timeouts (APITimeoutError) may arrive raw
+    # or wrapped by pydantic-ai, depending on its version
+    return isinstance(exc, APIConnectionError) or isinstance(
+        exc.__cause__, APIConnectionError
+    )
+
+
+async def _run_with_retry(agent: Agent, prompt: str, **kwargs):
+    """
+    Run an agent, retrying transient failures with jittered exponential backoff.
+    Each model request inside the run is bounded by the OpenAI client timeout.
+    """
+    for attempt in range(settings.agent_max_retries + 1):
+        try:
+            return await agent.run(prompt, **kwargs)
+        except Exception as e:
+            if attempt == settings.agent_max_retries or not _is_retryable(e):
+                raise
+            await asyncio.sleep(random.uniform(0.1, 0.5) * 2**attempt)
+
+
+async def _plan_from_intent(
+    user_id: str, intent: TripIntent
+) -> Optional[VacationPlan]:
+    """
+    Run the planning tool chain directly in Python for a well-specified request.
+    Returns None if the intent is incomplete or a step comes back empty, in
+    which case the caller falls back to the full tool-calling agent.
+    """
+    if not intent.is_new_trip_request or not intent.destination_city:
+        return None
+
+    prefs = get_user_preferences(user_id)
+
+    start, end = intent.start_date, intent.end_date
+    if start is None or end is None:
+        duration = intent.duration_days
+        if not duration or duration <= 0:
+            return None
+        trip_length = timedelta(days=duration)
+        if start is not None:
+            end = start + trip_length
+        elif end is not None:
+            start = end - trip_length
+        else:
+            # No dates at all: take the first free calendar window
+            free_ranges = find_free_date_ranges(
+                user_id=user_id,
+                trip_duration_days=duration,
+                window_days=60,
             )
-        )
+            if not free_ranges:
+                return None
+            start = free_ranges[0].start
+            end = start + trip_length
+    # Past or inverted dates need the agent to clarify with the user
+    if end <= start or start < date.today():
+        return None
+
+    options = await _search_trip_options(
+        prefs,
+        origin=intent.origin or prefs.home_city,
+        destination=intent.destination_code or intent.destination_city,
+        destination_city=intent.destination_city,
+        start=start,
+        end=end,
+    )
+    if not options.flights or not options.hotels:
+        return None
 
-    plan = VacationPlan(
-        user_id=ctx.deps.user_id,
-        destination_city=destination_city,
-        start_date=start,
-        end_date=end,
-        flight=flight,
-        hotel=hotel,
-        daily_plans=daily_plans,
-        estimated_total_cost=total_cost,
-        currency=prefs.default_currency,
-        status="planned",
+    return _assemble_plan(
+        user_id=user_id,
+        prefs=prefs,
+        destination_city=intent.destination_city,
+        start=start,
+        end=end,
+        flight=min(options.flights, key=lambda f: f.price),
+        hotel=min(options.hotels, key=lambda h: h.total_price),
     )
-    return plan
 
 
+def _intent_prompt(agent_input: AgentInput) -> str:
+    return (
+        f"Current date: {date.today().isoformat()}\n"
+        f"User message: {agent_input.user_message}"
+    )
+
+
+async def _try_fast_path(
+    agent_input: AgentInput,
+) -> Optional[Tuple[TripIntent, VacationPlan]]:
+    """
+    Fast path: the LLM only extracts the intent (and later writes the prose);
+    the tool chain in between runs in Python with no model round-trips.
+    Returns None when the tool-calling agent has to handle the turn.
+    """
+    # Follow-up edits to an existing plan always need the tool-calling agent,
+    # so don't spend a model round-trip on intent extraction first
+    if agent_input.current_plan is not None:
+        return None
+
+    intent_result = await _run_with_retry(
+        intent_agent,
+        _intent_prompt(agent_input),
+        usage_limits=_FAST_PATH_LIMITS,
+    )
+    intent = intent_result.output
+    plan = await _plan_from_intent(agent_input.user_id, intent)
+    if plan is None:
+        return None
+    return intent, plan
+
+
+def _summary_prompt(user_message: str, plan: VacationPlan) -> str:
+    return f"User request: {user_message}\n\nVacationPlan:\n{plan.model_dump_json()}"
+
+
+# Overall deadline for a streamed turn: enough for the longest (fallback) run
+_STREAM_DEADLINE_SECONDS = settings.agent_request_timeout * settings.agent_request_limit
+
+T = TypeVar("T")
+
 
-# Agent run helper
+async def _with_deadline(stream: AsyncIterator[T], deadline: float) -> AsyncIterator[T]:
+    """
+    Re-yield items from stream, raising asyncio.TimeoutError once the event-loop
+    time `deadline` passes, whether the provider stalls or the client reads slowly.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = stream.__aiter__()
+    while True:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise asyncio.TimeoutError
+        try:
+            item = await asyncio.wait_for(iterator.__anext__(), remaining)
+        except StopAsyncIteration:
+            return
+        yield item
+
+
+# Agent run helpers
 async def run_vacation_agent(
     user_message: str,
     user_id: str,
     allow_booking: bool = False,
     current_plan: Optional[VacationPlan] = None,
 ) -> AgentOutput:
+    cache_key = _agent_cache_key(user_id, user_message, allow_booking, current_plan)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+
     agent_input = AgentInput(
         user_message=user_message,
         user_id=user_id,
@@ -268,14 +604,104 @@ async def run_vacation_agent(
         current_plan=current_plan,
     )
 
-    usage_limits = UsageLimits(
-        request_limit=20,     # still generous for a simple plan
-        tool_calls_limit=10,   # e.g. 5 tools + some slack
-    )
+    async with _agent_semaphore:
+        fast_path = await _try_fast_path(agent_input)
 
-    result = await vacation_agent.run(
-        agent_input.user_message,
-        deps=agent_input,
-        usage_limits=usage_limits,
+        if fast_path is not None:
+            intent, plan = fast_path
+            summary_result = await _run_with_retry(
+                summary_agent,
+                _summary_prompt(user_message, plan),
+                usage_limits=_FAST_PATH_LIMITS,
+            )
+            output = AgentOutput(
+                assistant_message=summary_result.output,
+                updated_plan=plan,
+                ask_for_booking_confirmation=intent.wants_booking,
+            )
+        else:
+            # Ambiguous or follow-up request: let the tool-calling agent handle it
+            result = await _run_with_retry(
+                vacation_agent,
+                agent_input.user_message,
+                deps=agent_input,
+                usage_limits=_FALLBACK_LIMITS,
+            )
+            output = result.output
+
+    _cache_put(cache_key, output)
+    return output
+
+
+async def stream_vacation_agent(
+    user_message: str,
+    user_id: str,
+    allow_booking: bool = False,
+    current_plan: Optional[VacationPlan] = None,
+) -> AsyncIterator[Union[str, AgentOutput]]:
+    """
+    Streaming variant of run_vacation_agent.
+
+    Yields pieces of assistant_message as they are generated, then the complete
+    AgentOutput as the last item. Only the intent step is retried; once text
+    has been streamed to the client a retry is no longer possible. The streamed
+    part is bounded by an overall deadline so a stalled provider or a slow
+    reader can't hold a concurrency slot forever (raises asyncio.TimeoutError).
+    """
+    cache_key = _agent_cache_key(user_id, user_message, allow_booking, current_plan)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        yield cached.assistant_message
+        yield cached
+        return
+
+    agent_input = AgentInput(
+        user_message=user_message,
+        user_id=user_id,
+        allow_booking=allow_booking,
+        current_plan=current_plan,
     )
-    return result.output
+
+    async with _agent_semaphore:
+        fast_path = await _try_fast_path(agent_input)
+
+        deadline = asyncio.get_running_loop().time() + _STREAM_DEADLINE_SECONDS
+
+        if fast_path is not None:
+            intent, plan = fast_path
+            parts: List[str] = []
+            async with summary_agent.run_stream(
+                _summary_prompt(user_message, plan),
+                usage_limits=_FAST_PATH_LIMITS,
+            ) as result:
+                async for delta in _with_deadline(
+                    result.stream_text(delta=True), deadline
+                ):
+                    parts.append(delta)
+                    yield delta
+            output = AgentOutput(
+                assistant_message="".join(parts),
+                updated_plan=plan,
+                ask_for_booking_confirmation=intent.wants_booking,
+            )
+        else:
+            # The structured AgentOutput arrives last; stream only the growing
+            # assistant_message and keep the plan for the final item.
+            sent = ""
+            async with vacation_agent.run_stream(
+                agent_input.user_message,
+                deps=agent_input,
+                usage_limits=_FALLBACK_LIMITS,
+            ) as result:
+                async for partial in _with_deadline(result.stream_output(), deadline):
+                    text = partial.assistant_message or ""
+                    if len(text) > len(sent) and text.startswith(sent):
+                        yield text[len(sent):]
+                        sent = text
+                output = await result.get_output()
+            tail = output.assistant_message[len(sent):]
+            if tail and output.assistant_message.startswith(sent):
+                yield tail
+
+    _cache_put(cache_key, output)
+    yield output
@@ -14,6 +14,14 @@ class Settings(BaseModel):
     app_env: str = "dev"
     openai_model_name: str = "gpt-5-nano"
     openai_api_key: str = ""
+    agent_cache_ttl_seconds: float = 300.0
+    agent_max_concurrency: int = 16
+    # Per model request (one LLM call), not per multi-turn agent run
+    agent_request_timeout: float = 20.0
+    # Retries of a whole agent run on transient provider errors
+    agent_max_retries: int = 2
+    agent_tool_calls_limit: int = 6
+    agent_request_limit: int = 8
     
     class Config:
         frozen = True
@@ -25,4 +33,10 @@ def get_settings() -> Settings:
         app_env=os.getenv("APP_ENV", "dev"),
         openai_model_name=os.getenv("OPENAI_MODEL_NAME", "gpt-5-nano"),
         openai_api_key=os.getenv("OPENAI_API_KEY", ""),
+        agent_cache_ttl_seconds=float(os.getenv("AGENT_CACHE_TTL_SECONDS", "300")),
+        agent_max_concurrency=int(os.getenv("AGENT_MAX_CONCURRENCY", "16")),
+        agent_request_timeout=float(os.getenv("AGENT_REQUEST_TIMEOUT", "20")),
+        agent_max_retries=int(os.getenv("AGENT_MAX_RETRIES", "2")),
+        agent_tool_calls_limit=int(os.getenv("AGENT_TOOL_CALLS_LIMIT", "6")),
+        agent_request_limit=int(os.getenv("AGENT_REQUEST_LIMIT", "8")),
     )
\ No newline at end of file
@@ -4,8 +4,16 @@
 # FastAPI main module
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from .config import get_settings
 from .models.api import (
@@ -25,18 +33,46 @@ from .services.sessions import (
     attach_plan_to_session,
     get_latest_plan_for_session,
 )
-from .services.bookings import perform_booking
+from .services.bookings import (
+    drain_booking_queue,
+    start_booking_worker,
+    submit_booking,
+)
 from .storage.in_memory import (
+    BookingState,
+    get_booking,
+    get_booking_state,
     get_or_create_session,
 )
-from .agent.vacation_agent import run_vacation_agent
+from .agent.vacation_agent import (
+    AgentOutput,
+    openai_connection_pool,
+    run_vacation_agent,
+    stream_vacation_agent,
+)
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Pooled OpenAI connections live (and are released) with the app
+    async with openai_connection_pool():
+        booking_worker = start_booking_worker()
+        yield
+        # Give queued bookings a chance to finish, then stop the worker cleanly
+        await drain_booking_queue(timeout=5.0)
+        booking_worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await booking_worker
+
 
 app = FastAPI(
     title="Vacation Planner",
     version="0.1.0",
     description="FastAPI + Pydantic + PydanticAI + OpenAI GPT-5 Nano",
+    lifespan=lifespan,
 )
 
 # Allow local dev frontend (Streamlit or other) to call the API
@@ -64,11 +100,37 @@ async def get_preferences(user_id: str) -> PreferencesResponse:
 async def update_preferences(
     user_id: str, payload: PreferencesUpdateRequest
 ) -> PreferencesResponse:
-    data = {k: v for k, v in payload.model_dump().items() if v is not None}
+    data = payload.model_dump(exclude_none=True, exclude_unset=True)
     prefs = update_user_preferences(user_id, data)
     return PreferencesResponse(preferences=prefs)
 
 
+def _chat_response(request: ChatRequest, agent_output: AgentOutput) -> ChatResponse:
+    """
+    Store the updated plan (if any) on the session and build the API response.
+    """
+    updated_plan_id = None
+    if agent_output.updated_plan is not None:
+        updated_plan_id = attach_plan_to_session(
+            session_id=request.session_id,
+            user_id=request.user_id,
+            plan=agent_output.updated_plan,
+        )
+
+    # For now we don't expose plan_id to the client; the backend tracks it.
+    return ChatResponse(
+        session_id=request.session_id,
+        user_id=request.user_id,
+        assistant_message=agent_output.assistant_message,
+        plan=agent_output.updated_plan,
+        ask_for_booking_confirmation=agent_output.ask_for_booking_confirmation,
+    )
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
 # Chat endpoint
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat(request: ChatRequest) -> ChatResponse:
@@ -96,30 +158,70 @@ async def chat(request: ChatRequest) -> ChatResponse:
         current_plan=current_plan,
     )
 
-    updated_plan_id = None
-    if agent_output.updated_plan is not None:
-        updated_plan_id = attach_plan_to_session(
-            session_id=request.session_id,
-            user_id=request.user_id,
-            plan=agent_output.updated_plan,
-        )
+    return _chat_response(request, agent_output)
 
-    # For now we don't expose plan_id to the client; the backend tracks it.
-    return ChatResponse(
+
+# Streaming chat endpoint
+@app.post("/api/chat/stream")
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """
+    Same as /api/chat, but streamed as Server-Sent Events.
+
+    Emits `delta` events ({"delta": "..."}) while the assistant message is
+    generated, then one `final` event carrying the full ChatResponse. If the
+    model fails after streaming has started, an `error` event ({"detail": "..."})
+    ends the stream instead.
+    """
+    get_or_create_session(request.session_id, request.user_id)
+
+    current_plan = get_latest_plan_for_session(
         session_id=request.session_id,
         user_id=request.user_id,
-        assistant_message=agent_output.assistant_message,
-        plan=agent_output.updated_plan,
-        ask_for_booking_confirmation=agent_output.ask_for_booking_confirmation,
+    )
+
+    async def events() -> AsyncIterator[str]:
+        # The 200 header is already sent, so failures must be reported in-band
+        try:
+            async for item in stream_vacation_agent(
+                user_message=request.message,
+                user_id=request.user_id,
+                allow_booking=request.allow_booking,
+                current_plan=current_plan,
+            ):
+                if isinstance(item, AgentOutput):
+                    response = _chat_response(request, item)
+                    yield _sse("final", response.model_dump(mode="json"))
+                elif item:
+                    yield _sse("delta", {"delta": item})
+        except asyncio.TimeoutError:
+            yield _sse("error", {"detail": "The assistant took too long to respond."})
+        except Exception:
+            logger.exception("Streaming chat failed for session %s", request.session_id)
+            yield _sse("error", {"detail": "The assistant failed to respond; please try again."})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+def _book_response(state: BookingState) -> BookResponse:
+    return BookResponse(
+        session_id=state.session_id,
+        user_id=state.user_id,
+        booking_id=state.booking_id,
+        status=state.status,
+        confirmation=get_booking(state.booking_id),
+        error=state.error,
     )
 
 
 # Booking endpoint
-@app.post("/api/book", response_model=BookResponse)
+@app.post("/api/book", response_model=BookResponse, status_code=202)
 async def book_trip(request: BookRequest) -> BookResponse:
     """
     Confirm a booking for the latest plan in this session.
     This endpoint should only be called after the user has explicitly confirmed.
+
+    The booking is processed in the background; the response carries the
+    booking_id to poll via GET /api/book/{booking_id}.
     """
     session_state = get_or_create_session(request.session_id, request.user_id)
     if not session_state.last_plan_id:
@@ -134,13 +236,16 @@ async def book_trip(request: BookRequest) -> BookResponse:
         plan_id=session_state.last_plan_id,
     )
 
-    try:
-        confirmation = perform_booking(booking_request)
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return _book_response(submit_booking(booking_request))
 
-    return BookResponse(
-        session_id=request.session_id,
-        user_id=request.user_id,
-        confirmation=confirmation,
-    )
\ No newline at end of file
+
+@app.get("/api/book/{booking_id}", response_model=BookResponse)
+async def get_booking_status(booking_id: str, user_id: str) -> BookResponse:
+    """
+    Poll a booking submitted via POST /api/book.
+    Bookings of other users are reported as unknown.
+    """
+    state = get_booking_state(booking_id)
+    if state is None or state.user_id != user_id:
+        raise HTTPException(status_code=404, detail="Unknown booking.")
+    return _book_response(state)
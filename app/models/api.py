@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Optional, List
 from pydantic import BaseModel, Field
-from .domain import VacationPlan, BookingConfirmation, UserPreferences
+from .domain import VacationPlan, BookingConfirmation, BookingStatus, UserPreferences
 
 
 class ChatRequest(BaseModel):
@@ -34,7 +34,10 @@ class BookRequest(BaseModel):
 class BookResponse(BaseModel):
     session_id: str
     user_id: str
-    confirmation: BookingConfirmation
+    booking_id: str
+    status: BookingStatus
+    confirmation: Optional[BookingConfirmation] = None
+    error: Optional[str] = None
 
 
 class PreferencesResponse(BaseModel):
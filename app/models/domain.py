@@ -2,11 +2,18 @@
 from __future__ import annotations
 
 from datetime import date, datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+BookingStatus = Literal["pending", "confirmed", "failed"]
 
 
 class UserPreferences(BaseModel):
+    # Explicit pins of pydantic's defaults. Preference updates use
+    # model_copy(update=...), which skips validation entirely.
+    model_config = ConfigDict(validate_assignment=False, extra="ignore")
+
     user_id: str
     home_city: str = Field(..., description="Home city or airport code, e.g. 'SIN'")
     default_currency: str = "USD"
@@ -1,15 +1,30 @@
 # app/services/bookings.py: Booking service
 from __future__ import annotations
 
+import asyncio
+import logging
+from typing import Optional, Tuple
+
 from ..models.domain import BookingRequest, BookingConfirmation
 from ..storage.in_memory import (
-    get_plan,
+    BookingState,
+    create_booking_state,
+    find_plan,
+    get_booking_state,
     save_booking,
     get_or_create_session,
 )
 
+logger = logging.getLogger(__name__)
+
+# Bookings waiting for the background worker: (booking_id, request).
+# Created by start_booking_worker so it is bound to the app's running loop.
+_booking_queue: Optional[asyncio.Queue[Tuple[str, BookingRequest]]] = None
+
 
-def perform_booking(request: BookingRequest) -> BookingConfirmation:
+async def perform_booking(
+    booking_id: str, request: BookingRequest
+) -> BookingConfirmation:
     """
     Core booking logic.
 
@@ -20,7 +35,9 @@ def perform_booking(request: BookingRequest) -> BookingConfirmation:
     For PoC we just record a booking and synthesize confirmation codes.
     """
     session_state = get_or_create_session(request.session_id, request.user_id)
-    plan = get_plan(request.plan_id)
+    plan = find_plan(request.plan_id)
+    if plan is None:
+        raise ValueError("Plan has expired; please ask for a new plan")
 
     # Basic sanity check: plan belongs to the same user
     if plan.user_id != request.user_id:
@@ -30,6 +47,7 @@ def perform_booking(request: BookingRequest) -> BookingConfirmation:
     currency = plan.currency
 
     confirmation = save_booking(
+        booking_id=booking_id,
         user_id=request.user_id,
         session_id=request.session_id,
         plan_id=request.plan_id,
@@ -37,3 +55,64 @@ def perform_booking(request: BookingRequest) -> BookingConfirmation:
         currency=currency,
     )
     return confirmation
+
+
+def submit_booking(request: BookingRequest) -> BookingState:
+    """
+    Record a pending booking and queue it for the background worker.
+    """
+    if _booking_queue is None:
+        raise RuntimeError("Booking worker is not running")
+    state = create_booking_state(request.user_id, request.session_id)
+    _booking_queue.put_nowait((state.booking_id, request))
+    return state
+
+
+def start_booking_worker() -> asyncio.Task[None]:
+    """
+    Create a fresh booking queue on the running loop and start its worker;
+    called from the app lifespan.
+    """
+    global _booking_queue
+    _booking_queue = asyncio.Queue()
+    return asyncio.create_task(_run_booking_worker(_booking_queue))
+
+
+async def _run_booking_worker(
+    queue: asyncio.Queue[Tuple[str, BookingRequest]],
+) -> None:
+    """
+    Process queued bookings until cancelled.
+    """
+    while True:
+        booking_id, request = await queue.get()
+        state = get_booking_state(booking_id)
+        try:
+            await perform_booking(booking_id, request)
+            if state is not None:
+                state.status = "confirmed"
+        except ValueError as e:
+            if state is not None:
+                state.status = "failed"
+                state.error = str(e)
+        except Exception:
+            logger.exception("Booking %s failed", booking_id)
+            if state is not None:
+                state.status = "failed"
+                state.error = "Booking failed; please try again."
+        finally:
+            queue.task_done()
+
+
+async def drain_booking_queue(timeout: float) -> None:
+    """
+    Wait up to `timeout` seconds for already-queued bookings to be processed.
+    """
+    if _booking_queue is None:
+        return
+    try:
+        await asyncio.wait_for(_booking_queue.join(), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(
+            "%d queued booking(s) left pending at shutdown", _booking_queue.qsize()
+        )
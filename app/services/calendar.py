@@ -4,6 +4,8 @@ from __future__ import annotations
 from datetime import date, datetime, timedelta
 from typing import List
 
+import numpy as np
+
 from ..models.domain import CalendarEvent, DateRange
 from ..storage.in_memory import get_calendar_events, set_calendar_events
 
@@ -12,7 +14,7 @@ def seed_mock_calendar(user_id: str) -> None:
     """
     Optionally pre-populate some busy times for demonstration.
     """
-    if get_calendar_events(user_id):
+    if get_calendar_events(user_id).size:
         return
 
     today = date.today()
@@ -32,39 +34,35 @@ def find_free_date_ranges(
     user_id: str, trip_duration_days: int, window_days: int = 60
 ) -> List[DateRange]:
     """
-    Very naive algorithm: mark days as busy if any event overlaps, then find
-    contiguous free blocks at least `trip_duration_days` long within the next `window_days`.
+    Mark days as busy in a bitmap (one slot per day of the next `window_days`)
+    if any event overlaps, then find contiguous free blocks at least
+    `trip_duration_days` long.
     """
     seed_mock_calendar(user_id)
-    busy_events = get_calendar_events(user_id)
-
-    today = date.today()
-    busy_days = set()
-    for e in busy_events:
-        d = e.start.date()
-        while d <= e.end.date():
-            busy_days.add(d)
-            d += timedelta(days=1)
+    events = get_calendar_events(user_id)
 
-    free_ranges: List[DateRange] = []
-    start = None
+    # Clip every event to the window at once, then mark the covered days with a
+    # +1/-1 difference array so overlapping events need no per-event loop
+    today_ord = date.today().toordinal()
+    lo = np.clip(events["start_ord"] - today_ord, 0, window_days)
+    hi = np.clip(events["end_ord"] - today_ord + 1, 0, window_days)
+    in_window = hi > lo
+    delta = np.zeros(window_days + 1, dtype=np.int32)
+    np.add.at(delta, lo[in_window], 1)
+    np.add.at(delta, hi[in_window], -1)
+    busy = np.cumsum(delta[:-1]) > 0
 
-    for offset in range(window_days):
-        d = today + offset * timedelta(days=1)
-        if d in busy_days:
-            if start is not None:
-                # end the current free streak
-                if (d - start).days >= trip_duration_days:
-                    free_ranges.append(DateRange(start=start, end=d - timedelta(days=1)))
-                start = None
-        else:
-            if start is None:
-                start = d
+    # Pad with busy days on both ends so every free run has a start and an end edge
+    edges = np.flatnonzero(
+        np.diff(np.concatenate(([True], busy, [True])).astype(np.int8))
+    )
+    run_starts, run_ends = edges[0::2], edges[1::2]
+    long_enough = (run_ends - run_starts) >= trip_duration_days
 
-    # tail
-    if start is not None:
-        d = today + timedelta(days=window_days)
-        if (d - start).days >= trip_duration_days:
-            free_ranges.append(DateRange(start=start, end=d - timedelta(days=1)))
-
-    return free_ranges
+    return [
+        DateRange(
+            start=date.fromordinal(today_ord + int(s)),
+            end=date.fromordinal(today_ord + int(e) - 1),
+        )
+        for s, e in zip(run_starts[long_enough], run_ends[long_enough])
+    ]
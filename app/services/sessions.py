@@ -4,7 +4,7 @@ from __future__ import annotations
 from typing import Optional
 
 from ..models.domain import VacationPlan
-from ..storage.in_memory import get_or_create_session, save_plan, PLANS
+from ..storage.in_memory import get_or_create_session, save_plan, find_plan
 
 
 def attach_plan_to_session(
@@ -25,4 +25,4 @@ def get_latest_plan_for_session(
     session = get_or_create_session(session_id, user_id)
     if not session.last_plan_id:
         return None
-    return PLANS.get(session.last_plan_id)
\ No newline at end of file
+    return find_plan(session.last_plan_id)
\ No newline at end of file
@@ -1,57 +1,113 @@
 # app/storage/in_memory.py: In-memory storage
 from __future__ import annotations
 
+import secrets
+import threading
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import List, Optional
 from uuid import uuid4
 
-from pydantic import BaseModel
+import numpy as np
+from cachetools import LRUCache, TTLCache
 
 from ..models.domain import (
     UserPreferences,
     CalendarEvent,
     VacationPlan,
     BookingConfirmation,
+    BookingStatus,
 )
 
 
-class SessionState(BaseModel):
+@dataclass(slots=True)
+class SessionState:
     session_id: str
     user_id: str
     last_plan_id: Optional[str] = None
 
 
-# In-memory "databases"
-PREFERENCES: Dict[str, UserPreferences] = {}
-CALENDAR_EVENTS: Dict[str, List[CalendarEvent]] = {}
-PLANS: Dict[str, VacationPlan] = {}
-BOOKINGS: Dict[str, BookingConfirmation] = {}
-SESSIONS: Dict[str, SessionState] = {}
+@dataclass(slots=True)
+class BookingState:
+    booking_id: str
+    user_id: str
+    session_id: str
+    status: BookingStatus = "pending"
+    error: Optional[str] = None
+
+
+# Calendar events are stored column-wise as day ordinals; the free-range scan
+# only needs which days each event covers, not the full CalendarEvent models.
+CALENDAR_EVENT_DTYPE = np.dtype(
+    [("start_ord", np.int32), ("end_ord", np.int32), ("all_day", np.bool_)]
+)
+
+
+# In-memory "databases", bounded so sustained traffic can't grow them forever.
+# Conversation state (sessions, plans) expires an hour after it was last
+# accessed: TTLCache only counts from the last write, so the accessors below
+# write entries back on every read. User data (preferences, calendars,
+# bookings) is only evicted by size, least recently used first.
+PREFERENCES: LRUCache[str, UserPreferences] = LRUCache(maxsize=10_000)
+CALENDAR_EVENTS: LRUCache[str, np.ndarray] = LRUCache(maxsize=10_000)
+PLANS: TTLCache[str, VacationPlan] = TTLCache(maxsize=50_000, ttl=3600)
+BOOKINGS: LRUCache[str, BookingConfirmation] = LRUCache(maxsize=50_000)
+BOOKING_STATES: LRUCache[str, BookingState] = LRUCache(maxsize=50_000)
+SESSIONS: TTLCache[str, SessionState] = TTLCache(maxsize=10_000, ttl=3600)
+
+# cachetools caches are not thread-safe, and sync agent tools run in worker threads
+_lock = threading.RLock()
 
 
 def get_or_create_session(session_id: str, user_id: str) -> SessionState:
-    existing = SESSIONS.get(session_id)
-    if existing:
-        return existing
-    state = SessionState(session_id=session_id, user_id=user_id)
-    SESSIONS[session_id] = state
-    return state
+    with _lock:
+        existing = SESSIONS.get(session_id)
+        if existing:
+            # Write back to restart the TTL on activity
+            SESSIONS[session_id] = existing
+            return existing
+        state = SessionState(session_id=session_id, user_id=user_id)
+        SESSIONS[session_id] = state
+        return state
 
 
 def save_plan(plan: VacationPlan) -> str:
-    plan_id = str(uuid4())
-    PLANS[plan_id] = plan
+    # Short random key; 64 bits is plenty for an in-memory store
+    plan_id = secrets.token_hex(8)
+    with _lock:
+        PLANS[plan_id] = plan
     return plan_id
 
 
-def get_plan(plan_id: str) -> VacationPlan:
-    return PLANS[plan_id]
+def find_plan(plan_id: str) -> Optional[VacationPlan]:
+    with _lock:
+        plan = PLANS.get(plan_id)
+        if plan is not None:
+            # Write back to restart the TTL on activity
+            PLANS[plan_id] = plan
+        return plan
+
+
+def create_booking_state(user_id: str, session_id: str) -> BookingState:
+    state = BookingState(booking_id=str(uuid4()), user_id=user_id, session_id=session_id)
+    with _lock:
+        BOOKING_STATES[state.booking_id] = state
+    return state
+
+
+def get_booking_state(booking_id: str) -> Optional[BookingState]:
+    with _lock:
+        return BOOKING_STATES.get(booking_id)
 
 
 def save_booking(
-    user_id: str, session_id: str, plan_id: str, total: float, currency: str
+    booking_id: str,
+    user_id: str,
+    session_id: str,
+    plan_id: str,
+    total: float,
+    currency: str,
 ) -> BookingConfirmation:
-    booking_id = str(uuid4())
     confirmation = BookingConfirmation(
         booking_id=booking_id,
         user_id=user_id,
@@ -63,35 +119,59 @@ def save_booking(
         currency=currency,
         created_at=datetime.utcnow(),
     )
-    BOOKINGS[booking_id] = confirmation
+    with _lock:
+        BOOKINGS[booking_id] = confirmation
     return confirmation
 
 
+def get_booking(booking_id: str) -> Optional[BookingConfirmation]:
+    with _lock:
+        return BOOKINGS.get(booking_id)
+
+
 def get_or_create_preferences(user_id: str) -> UserPreferences:
-    prefs = PREFERENCES.get(user_id)
-    if prefs:
+    with _lock:
+        prefs = PREFERENCES.get(user_id)
+        if prefs:
+            return prefs
+        prefs = UserPreferences(
+            user_id=user_id,
+            home_city="SIN",
+            default_currency="USD",
+            interests=["food", "museums"],
+            travel_style="balanced",
+        )
+        PREFERENCES[user_id] = prefs
         return prefs
-    prefs = UserPreferences(
-        user_id=user_id,
-        home_city="SIN",
-        default_currency="USD",
-        interests=["food", "museums"],
-        travel_style="balanced",
-    )
-    PREFERENCES[user_id] = prefs
-    return prefs
 
 
 def update_preferences(user_id: str, update: dict) -> UserPreferences:
-    prefs = get_or_create_preferences(user_id)
-    updated = prefs.model_copy(update=update, deep=True)
-    PREFERENCES[user_id] = updated
-    return updated
+    with _lock:
+        prefs = get_or_create_preferences(user_id)
+        updated = prefs.model_copy(update=update)
+        PREFERENCES[user_id] = updated
+        return updated
 
 
-def get_calendar_events(user_id: str) -> List[CalendarEvent]:
-    return CALENDAR_EVENTS.get(user_id, [])
+def get_calendar_events(user_id: str) -> np.ndarray:
+    """
+    Return the user's events as a CALENDAR_EVENT_DTYPE array (empty if none).
+    """
+    with _lock:
+        events = CALENDAR_EVENTS.get(user_id)
+    if events is None:
+        return np.empty(0, dtype=CALENDAR_EVENT_DTYPE)
+    return events
 
 
 def set_calendar_events(user_id: str, events: List[CalendarEvent]) -> None:
-    CALENDAR_EVENTS[user_id] = events
\ No newline at end of file
+    array = np.fromiter(
+        (
+            (e.start.date().toordinal(), e.end.date().toordinal(), e.all_day)
+            for e in events
+        ),
+        dtype=CALENDAR_EVENT_DTYPE,
+        count=len(events),
+    )
+    with _lock:
+        CALENDAR_EVENTS[user_id] = array
\ No newline at end of file
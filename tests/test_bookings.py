@@ -0,0 +1,107 @@
+# tests/test_bookings.py: background booking flow
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, timedelta
+
+from app.models.domain import (
+    BookingRequest,
+    DayPlan,
+    FlightOption,
+    HotelOption,
+    VacationPlan,
+)
+from app.services.bookings import start_booking_worker, submit_booking
+from app.services.sessions import attach_plan_to_session
+from app.storage.in_memory import get_booking, get_booking_state
+
+
+def _plan(user_id: str) -> VacationPlan:
+    start = date.today() + timedelta(days=7)
+    end = start + timedelta(days=2)
+    departure = datetime.combine(start, datetime.min.time()).replace(hour=9)
+    return VacationPlan(
+        user_id=user_id,
+        destination_city="Tokyo",
+        start_date=start,
+        end_date=end,
+        flight=FlightOption(
+            id="FL-SIN-TYO-0",
+            origin="SIN",
+            destination="TYO",
+            departure=departure,
+            arrival=departure + timedelta(hours=7),
+            airline="Demo Air",
+            price=300.0,
+        ),
+        hotel=HotelOption(
+            id="HT-Tokyo-0",
+            destination_city="Tokyo",
+            name="Demo Hotel 0",
+            check_in=start,
+            check_out=end,
+            price_per_night=80.0,
+            total_price=160.0,
+        ),
+        daily_plans=[
+            DayPlan(date=start, morning="m", afternoon="a", evening="e"),
+            DayPlan(date=start + timedelta(days=1), morning="m", afternoon="a", evening="e"),
+        ],
+        estimated_total_cost=460.0,
+    )
+
+
+async def _submit_and_poll(request: BookingRequest) -> str:
+    worker = start_booking_worker()
+    try:
+        state = submit_booking(request)
+        assert state.status == "pending"
+        for _ in range(100):
+            if state.status != "pending":
+                break
+            await asyncio.sleep(0.01)
+        return state.booking_id
+    finally:
+        worker.cancel()
+        try:
+            await worker
+        except asyncio.CancelledError:
+            pass
+
+
+def test_submitted_booking_is_confirmed_by_the_worker():
+    user_id, session_id = "test-booking-user", "test-booking-session"
+    plan_id = attach_plan_to_session(session_id, user_id, _plan(user_id))
+    request = BookingRequest(
+        user_id=user_id,
+        session_id=session_id,
+        payment_token="tok_test",
+        plan_id=plan_id,
+    )
+
+    booking_id = asyncio.run(_submit_and_poll(request))
+
+    state = get_booking_state(booking_id)
+    assert state.status == "confirmed"
+    assert state.error is None
+    confirmation = get_booking(booking_id)
+    assert confirmation.plan_id == plan_id
+    assert confirmation.total_charged == 460.0
+
+
+def test_booking_another_users_plan_fails():
+    session_id = "test-booking-other-session"
+    plan_id = attach_plan_to_session(session_id, "plan-owner", _plan("plan-owner"))
+    request = BookingRequest(
+        user_id="someone-else",
+        session_id=session_id,
+        payment_token="tok_test",
+        plan_id=plan_id,
+    )
+
+    booking_id = asyncio.run(_submit_and_poll(request))
+
+    state = get_booking_state(booking_id)
+    assert state.status == "failed"
+    assert state.error == "Plan does not belong to this user"
+    assert get_booking(booking_id) is None
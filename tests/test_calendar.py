@@ -0,0 +1,81 @@
+# tests/test_calendar.py: free date range search
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+from app.models.domain import CalendarEvent, DateRange
+from app.services.calendar import find_free_date_ranges
+from app.storage.in_memory import set_calendar_events
+
+
+def _event(user_id: str, first_offset: int, last_offset: int) -> CalendarEvent:
+    today = date.today()
+    return CalendarEvent(
+        user_id=user_id,
+        title="Busy",
+        start=datetime.combine(today + timedelta(days=first_offset), datetime.min.time()),
+        end=datetime.combine(today + timedelta(days=last_offset), datetime.max.time()),
+    )
+
+
+def _range(first_offset: int, last_offset: int) -> DateRange:
+    today = date.today()
+    return DateRange(
+        start=today + timedelta(days=first_offset),
+        end=today + timedelta(days=last_offset),
+    )
+
+
+def test_events_are_clipped_at_both_window_edges():
+    user_id = "test-calendar-clip"
+    set_calendar_events(
+        user_id,
+        [
+            _event(user_id, -5, 1),   # starts before the window
+            _event(user_id, 8, 20),   # ends after the window
+        ],
+    )
+
+    assert find_free_date_ranges(user_id, trip_duration_days=3, window_days=10) == [
+        _range(2, 7)
+    ]
+    assert find_free_date_ranges(user_id, trip_duration_days=7, window_days=10) == []
+
+
+def test_overlapping_events_merge_into_one_busy_block():
+    user_id = "test-calendar-overlap"
+    set_calendar_events(
+        user_id,
+        [
+            _event(user_id, 2, 4),
+            _event(user_id, 3, 6),
+            _event(user_id, 3, 3),
+        ],
+    )
+
+    assert find_free_date_ranges(user_id, trip_duration_days=2, window_days=12) == [
+        _range(0, 1),
+        _range(7, 11),
+    ]
+
+
+def test_events_outside_the_window_leave_it_free():
+    user_id = "test-calendar-outside"
+    set_calendar_events(
+        user_id,
+        [
+            _event(user_id, -10, -1),
+            _event(user_id, 5, 9),
+        ],
+    )
+
+    assert find_free_date_ranges(user_id, trip_duration_days=1, window_days=5) == [
+        _range(0, 4)
+    ]
+
+
+def test_zero_day_window_has_no_free_ranges():
+    user_id = "test-calendar-empty-window"
+    set_calendar_events(user_id, [_event(user_id, 1, 1)])
+
+    assert find_free_date_ranges(user_id, trip_duration_days=1, window_days=0) == []
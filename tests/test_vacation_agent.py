@@ -0,0 +1,156 @@
+# tests/test_vacation_agent.py: deterministic planning path and agent routing
+from __future__ import annotations
+
+import asyncio
+import os
+from datetime import date, datetime, timedelta
+
+# The module builds its OpenAI client at import; no request ever reaches it here.
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.test import TestModel
+
+from app.agent.vacation_agent import (
+    TripIntent,
+    _plan_from_intent,
+    intent_agent,
+    run_vacation_agent,
+    summary_agent,
+    vacation_agent,
+)
+from app.models.domain import CalendarEvent
+from app.services.preferences import update_user_preferences
+from app.storage.in_memory import set_calendar_events
+
+
+def _days(n: int) -> date:
+    return date.today() + timedelta(days=n)
+
+
+def _intent(**kwargs) -> TripIntent:
+    kwargs.setdefault("is_new_trip_request", True)
+    kwargs.setdefault("destination_city", "Tokyo")
+    return TripIntent(**kwargs)
+
+
+def _plan(user_id: str, intent: TripIntent):
+    return asyncio.run(_plan_from_intent(user_id, intent))
+
+
+def _must_not_run(messages, info: AgentInfo):
+    raise AssertionError("this agent should not have been called")
+
+
+def test_plan_uses_given_dates():
+    plan = _plan("test-intent-dates", _intent(start_date=_days(10), end_date=_days(13)))
+
+    assert (plan.start_date, plan.end_date) == (_days(10), _days(13))
+    assert len(plan.daily_plans) == 3
+    # Cheapest options are picked
+    assert plan.flight.price == 300.0
+    assert plan.hotel.price_per_night == 80.0
+    assert plan.estimated_total_cost == plan.flight.price + plan.hotel.total_price
+
+
+def test_plan_with_only_duration_uses_first_free_window():
+    user_id = "test-intent-duration"
+    set_calendar_events(
+        user_id,
+        [
+            CalendarEvent(
+                user_id=user_id,
+                title="Busy",
+                start=datetime.combine(_days(0), datetime.min.time()),
+                end=datetime.combine(_days(1), datetime.max.time()),
+            )
+        ],
+    )
+
+    plan = _plan(user_id, _intent(duration_days=4))
+
+    assert (plan.start_date, plan.end_date) == (_days(2), _days(6))
+
+
+def test_plan_keeps_start_date_given_with_duration():
+    plan = _plan("test-intent-start", _intent(start_date=_days(30), duration_days=5))
+
+    assert (plan.start_date, plan.end_date) == (_days(30), _days(35))
+
+
+def test_plan_keeps_end_date_given_with_duration():
+    plan = _plan("test-intent-end", _intent(end_date=_days(30), duration_days=5))
+
+    assert (plan.start_date, plan.end_date) == (_days(25), _days(30))
+
+
+def test_incomplete_or_invalid_intent_returns_none():
+    user_id = "test-intent-incomplete"
+
+    assert _plan(user_id, _intent(is_new_trip_request=False, duration_days=3)) is None
+    assert _plan(user_id, _intent(destination_city=None, duration_days=3)) is None
+    assert _plan(user_id, _intent()) is None  # neither dates nor duration
+    assert _plan(user_id, _intent(start_date=_days(-3), duration_days=5)) is None
+    assert _plan(user_id, _intent(start_date=_days(5), end_date=_days(5))) is None
+
+
+def test_empty_search_results_return_none():
+    user_id = "test-intent-budget"
+    update_user_preferences(user_id, {"max_budget_total": 10.0})
+
+    assert _plan(user_id, _intent(start_date=_days(10), end_date=_days(13))) is None
+
+
+def test_complete_request_takes_the_fast_path():
+    intent_args = {
+        "is_new_trip_request": True,
+        "destination_city": "Tokyo",
+        "start_date": _days(10).isoformat(),
+        "end_date": _days(13).isoformat(),
+    }
+    with intent_agent.override(model=TestModel(custom_output_args=intent_args)), \
+            summary_agent.override(model=TestModel(custom_output_text="Enjoy Tokyo!")), \
+            vacation_agent.override(model=FunctionModel(_must_not_run)):
+        output = asyncio.run(
+            run_vacation_agent("3 days in Tokyo", user_id="test-route-fast")
+        )
+
+    assert output.assistant_message == "Enjoy Tokyo!"
+    assert output.updated_plan.destination_city == "Tokyo"
+    assert output.updated_plan.start_date == _days(10)
+
+
+def test_ambiguous_request_falls_back_to_the_tool_calling_agent():
+    fallback = TestModel(
+        call_tools=[], custom_output_args={"assistant_message": "Where to?"}
+    )
+    with intent_agent.override(
+        model=TestModel(custom_output_args={"is_new_trip_request": False})
+    ), summary_agent.override(model=FunctionModel(_must_not_run)), \
+            vacation_agent.override(model=fallback):
+        output = asyncio.run(
+            run_vacation_agent("I want a holiday", user_id="test-route-fallback")
+        )
+
+    assert output.assistant_message == "Where to?"
+    assert output.updated_plan is None
+
+
+def test_follow_up_turn_skips_intent_extraction():
+    user_id = "test-route-follow-up"
+    current_plan = _plan(user_id, _intent(start_date=_days(10), end_date=_days(13)))
+
+    fallback = TestModel(
+        call_tools=[], custom_output_args={"assistant_message": "Updated."}
+    )
+    with intent_agent.override(model=FunctionModel(_must_not_run)), \
+            vacation_agent.override(model=fallback):
+        output = asyncio.run(
+            run_vacation_agent(
+                "Make it one day longer",
+                user_id=user_id,
+                current_plan=current_plan,
+            )
+        )
+
+    assert output.assistant_message == "Updated."